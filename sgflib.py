@@ -82,15 +82,18 @@ In addition, this library contains several utility classes:
 import sys
 import os
 import os.path
+import io
 import warnings
 import argparse
 import datetime
 import re
 import textwrap
 import collections
-import itertools
+import concurrent.futures
+import functools
+import mmap
+import operator
 import math
-from copy import deepcopy
 
 
 TEXT_ENCODING = 'UTF-8'
@@ -102,6 +105,16 @@ NAME_ENCODING = 'ASCII'
 PRETTY_INDENT_SPACES = 2
 """Per-level indent for pretty-formatted output."""
 
+pretty_indents = ['']
+"""Cache of indentation strings by depth, grown on demand by
+`pretty_indent()`."""
+
+def pretty_indent(depth):
+    """Return the indentation string for pretty-format level `depth`."""
+    while len(pretty_indents) <= depth:
+        pretty_indents.append(pretty_indents[-1] + ' ' * PRETTY_INDENT_SPACES)
+    return pretty_indents[depth]
+
 
 class Error(Exception):
     """Base class for sgflib exceptions."""
@@ -177,7 +190,20 @@ class Collection(list):
         SGF text representation, accessed via `str(collection)`.
         Separates game trees with a blank line.
         """
-        return '\n\n'.join(str(item) for item in self)
+        out = io.StringIO()
+        self.write_text(out)
+        return out.getvalue()
+
+    def write_text(self, out):
+        """
+        Write the SGF text representation to the file-like `out`, one node
+        at a time. Separates game trees with a blank line.
+        """
+        separator = ''
+        for gametree in self:
+            out.write(separator)
+            separator = '\n\n'
+            gametree.write_text(out)
 
     def pretty(self):
         """
@@ -191,7 +217,20 @@ class Collection(list):
         SGF bytes representation, accessed via `bytes(collection)`.
         Separates game trees with a blank line.
         """
-        return b'\n\n'.join(bytes(item) for item in self)
+        out = io.BytesIO()
+        self.write(out)
+        return out.getvalue()
+
+    def write(self, out):
+        """
+        Write the SGF bytes representation to the file-like `out`, one node
+        at a time. Separates game trees with a blank line.
+        """
+        separator = b''
+        for gametree in self:
+            out.write(separator)
+            separator = b'\n\n'
+            gametree.write(out)
 
     def __repr__(self):
         """
@@ -217,7 +256,14 @@ class Collection(list):
                 path = None
             if path:
                 with open(path, 'rb') as src:
-                    data = src.read()
+                    try:
+                        # Zero-copy: let the parser scan the OS page cache
+                        # directly (the mapping outlives the file object):
+                        data = mmap.mmap(
+                            src.fileno(), 0, access=mmap.ACCESS_READ)
+                    except ValueError:
+                        # empty files cannot be mapped:
+                        data = src.read()
             else:
                 # read bytestring from <stdin>:
                 data = sys.stdin.buffer.read()
@@ -322,15 +368,44 @@ class GameTree(list):
         return copy
 
     def __eq__(self, other):
-        return super().__eq__(other) and self.branches == other.branches
+        if self is other:
+            return True
+        if not isinstance(other, GameTree):
+            return NotImplemented
+        if (len(self) != len(other)
+              or len(self.branches) != len(other.branches)):
+            return False
+        return list.__eq__(self, other) and self.branches == other.branches
 
     def __str__(self):
         """Return an SGF representation of this `GameTree`."""
-        parts = ['(']
-        parts.extend(str(item) for item in self)
-        parts.extend(str(branch) for branch in self.branches)
-        parts.append(')')
-        return '\n'.join(parts)
+        out = io.StringIO()
+        self.write_text(out)
+        return out.getvalue()
+
+    def write_text(self, out):
+        """Write the SGF text representation to the file-like `out`, one
+        node at a time. Iterative, so deeply branched games cannot
+        overflow the recursion limit."""
+        write = out.write
+        write('(')
+        for item in self:
+            write('\n')
+            write(str(item))
+        # one stack frame per open game (sub)tree: the branches still to
+        # be written; an exhausted frame closes its tree with ")":
+        stack = [iter(self.branches)]
+        while stack:
+            branch = next(stack[-1], None)
+            if branch is None:
+                write('\n)')
+                stack.pop()
+                continue
+            write('\n(')
+            for item in branch:
+                write('\n')
+                write(str(item))
+            stack.append(iter(branch.branches))
 
     def pretty(self, indent=0):
         """Return a pretty-formatted SGF representation of this `GameTree`."""
@@ -338,18 +413,39 @@ class GameTree(list):
         parts = ['(']
         parts.extend(item.pretty(indent) for item in self)
         parts.extend(branch.pretty(indent) for branch in self.branches)
-        spaces = ' ' * indent * PRETTY_INDENT_SPACES
         return (
-            f'\n{spaces}'.join(parts)
-            + f'\n{" "*(indent-1)*PRETTY_INDENT_SPACES})')
+            f'\n{pretty_indent(indent)}'.join(parts)
+            + f'\n{pretty_indent(indent - 1)})')
 
     def __bytes__(self):
         """Return an SGF bytes representation of this `GameTree`."""
-        parts = [b'(']
-        parts.extend(bytes(item) for item in self)
-        parts.extend(bytes(branch) for branch in self.branches)
-        parts.append(b')')
-        return b'\n'.join(parts)
+        out = io.BytesIO()
+        self.write(out)
+        return out.getvalue()
+
+    def write(self, out):
+        """Write the SGF bytes representation to the file-like `out`, one
+        node at a time. Iterative, so deeply branched games cannot
+        overflow the recursion limit."""
+        write = out.write
+        write(b'(')
+        for item in self:
+            write(b'\n')
+            write(bytes(item))
+        # one stack frame per open game (sub)tree: the branches still to
+        # be written; an exhausted frame closes its tree with ")":
+        stack = [iter(self.branches)]
+        while stack:
+            branch = next(stack[-1], None)
+            if branch is None:
+                write(b'\n)')
+                stack.pop()
+                continue
+            write(b'\n(')
+            for item in branch:
+                write(b'\n')
+                write(bytes(item))
+            stack.append(iter(branch.branches))
 
     def __repr__(self):
         nodelist = branches = ''
@@ -364,15 +460,33 @@ class GameTree(list):
         Return the main line of the game (nodes and variation A) as a new
         `GameTree`.
         """
-        if self.branches:
-            return GameTree(self + self.branches[0].trunk())
-        else:
+        if not self.branches:
             return self
+        nodes = []
+        gametree = self
+        while True:
+            nodes.extend(gametree)
+            if not gametree.branches:
+                break
+            gametree = gametree.branches[0]
+        return GameTree(nodes)
 
     # def cursor(self):
     #     """Return a `Cursor` object for navigation of this `GameTree`."""
     #     return Cursor(self)
 
+    def walk(self):
+        """
+        Yield every `Node` in this `GameTree`, depth-first: the trunk
+        first, then each branch in order. Iterative, so deeply branched
+        games cannot overflow the recursion limit.
+        """
+        stack = [self]
+        while stack:
+            gametree = stack.pop()
+            yield from gametree
+            stack.extend(reversed(gametree.branches))
+
     def property_search(self, pid, getall=0):
         """
         Search this `GameTree` for nodes containing matching properties.
@@ -380,32 +494,39 @@ class GameTree(list):
 
         Arguments:
 
-        - pid : string -- ID of properties to search for.
+        - pid : string -- ID (or long name) of properties to search for.
         - getall : boolean -- Set to true (1) to return all `Node`'s that
           match, or to false (0) to return only the first match.
         """
-        matches = []
-        for n in self:
-            if n.has_key(pid):
-                matches.append(n)
-                if not getall:
-                    break
-        else:    # getall or not matches:
-            for v in self.branches:
-                matches = matches + v.property_search(pid, getall)
-                if not getall and matches:
-                    break
-        return GameTree(matches)
+        # Accept a long property name as well as an SGF ID; resolve once,
+        # not per node:
+        pid = Node.property_names.get(pid, pid)
+        matches = (n for n in self.walk() if pid in n)
+        if getall:
+            return GameTree(list(matches))
+        first = next(matches, None)
+        return GameTree([first] if first is not None else [])
+
+    normalized = False
+    """Set by `normalize()`, cleared by `merge()`; lets `normalize()` skip
+    subtrees that haven't changed since they were last normalized. Code
+    that restructures a `GameTree` directly (rather than via `merge()`)
+    should reset this flag itself."""
 
     def normalize(self):
-        while self.branches:
-            if len(self.branches) == 1:
-                self.extend(self.branches[0])
-                self.branches = self.branches[0].branches
-            else:
-                for index, branch in enumerate(self.branches):
-                    branch.normalize()
-                break
+        pending = [self]
+        while pending:
+            gametree = pending.pop()
+            if gametree.normalized:
+                # Unchanged since its last normalization (so are all of its
+                # branches; any merged-into branch cleared its own flag):
+                continue
+            while len(gametree.branches) == 1:
+                only_branch = gametree.branches[0]
+                gametree.extend(only_branch)
+                gametree.branches = only_branch.branches
+            gametree.normalized = True
+            pending.extend(gametree.branches)
 
     def merge(self, other, comment=None, comments_everywhere=True,
               ignore_property_values=None):
@@ -414,10 +535,11 @@ class GameTree(list):
         plays with prefix `comment` (once, at point of deviation).
         """
         # TODO: add labels to branches
+        self.normalized = False
         # In case either `self` or `other` are empty:
         i = -1
         other = other.deepcopy()
-        for (i, my_node, other_node) in zip(itertools.count(), self, other):
+        for (i, (my_node, other_node)) in enumerate(zip(self, other)):
             if my_node.equivalent(other_node):
                 my_node.merge(
                     other_node, comment, comments_everywhere,
@@ -460,18 +582,40 @@ class GameTree(list):
                 return
             if not self.branches:
                 self.branches.append(GameTree([Node(C='')]))
-            # Merge branches:
+            # Merge branches. Index the branches of `other` by the merge
+            # signature of their head nodes, so each branch of `self` finds
+            # its mate with a dict lookup instead of a pairwise equivalence
+            # scan (typeless heads are wildcards & pair with anything):
+            remaining = dict(enumerate(other.branches))
+            by_signature = collections.defaultdict(collections.deque)
+            for (index, other_branch) in remaining.items():
+                by_signature[other_branch[0].merge_signature()].append(index)
+            wildcards = by_signature[None]
             for self_branch in self.branches[:]:
-                for (i, other_branch) in enumerate(other.branches[:]):
-                    if self_branch[0].equivalent(other_branch[0]):
-                        self_branch.merge(
-                            other_branch, comment, comments_everywhere,
-                            ignore_property_values)
-                        del other.branches[i]
-                        break
-            for other_branch in other.branches:
+                if not remaining:
+                    break
+                signature = self_branch[0].merge_signature()
+                if signature is None:
+                    # wildcard: pairs with the first remaining branch
+                    index = next(iter(remaining))
+                else:
+                    exact = by_signature[signature]
+                    # discard indexes already claimed:
+                    while exact and exact[0] not in remaining:
+                        exact.popleft()
+                    while wildcards and wildcards[0] not in remaining:
+                        wildcards.popleft()
+                    candidates = [
+                        queue[0] for queue in (exact, wildcards) if queue]
+                    if not candidates:
+                        continue
+                    index = min(candidates)
+                self_branch.merge(
+                    remaining.pop(index), comment, comments_everywhere,
+                    ignore_property_values)
+            for other_branch in remaining.values():
                 other_branch.prefix_comment(comment)
-            self.branches.extend(other.branches)
+            self.branches.extend(remaining.values())
 
     def prefix_comment(self, comment):
         if not comment:
@@ -506,6 +650,11 @@ class Node(dict):
                 f"Unknown SGF property name or ID: '{name}'")
 
     def __getattr__(self, name):
+        if name not in self.property_ids and name not in self.property_names:
+            # Not an SGF property. Raise AttributeError (not PropertyError)
+            # so that hasattr() and protocol probes (__deepcopy__ etc.)
+            # fail fast through the normal attribute machinery:
+            raise AttributeError(name)
         key = self.resolve_property_id(name)
         try:
             return self[key]
@@ -531,73 +680,89 @@ class Node(dict):
                 raise PropertyError(
                     f"No '{name}' property (SGF ID '{key}') in Node") from None
 
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        # adding a property may change the node type & serialized form:
+        self.__dict__.pop('_cached_node_type', None)
+        self.__dict__.pop('_cached_merge_signature', None)
+        self.__dict__.pop('_cached_bytes', None)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        # removing a property may change the node type & serialized form:
+        self.__dict__.pop('_cached_node_type', None)
+        self.__dict__.pop('_cached_merge_signature', None)
+        self.__dict__.pop('_cached_bytes', None)
+
     def __str__(self):
         """Return an SGF text representation of this `Node`."""
-        parts = [';']
-        for (name, value) in self.items():
-            parts.append(name)
-            parts.append('[')
-            if name in self.list_properties:
-                parts.append(']['.join(
-                    self.escape_text(str(item)) for item in value))
-            else:
-                parts.append(self.escape_text(str(value)))
-            parts.append(']')
-        return ''.join(parts)
+        return ';' + ''.join(
+            f'{name}[{self._format_value(name, value)}]'
+            for (name, value) in self.items())
+
+    def _format_value(self, name, value):
+        """Escape (& join, for list properties) one property value."""
+        if name in self.list_properties:
+            return ']['.join(self.escape_text(str(item)) for item in value)
+        else:
+            return self.escape_text(str(value))
 
     def pretty(self, indent=0):
         return str(self)
 
     def __bytes__(self):
-        """SGF bytes representation."""
-        parts = [b';']
+        """SGF bytes representation, cached until this `Node` changes."""
+        cached = self.__dict__.get('_cached_bytes')
+        if cached is not None:
+            return cached
+        output = bytearray(b';')
         for (name, value) in self.items():
             encoding = (
                 TEXT_ENCODING if name in self.text_properties
                 else NAME_ENCODING)
-            parts.append(bytes(name, NAME_ENCODING))
-            parts.append(b'[')
+            output += (self.property_id_bytes.get(name)
+                       or bytes(name, NAME_ENCODING))
+            output += b'['
             if name in self.list_properties:
-                parts.append(b']['.join(
-                    bytes(self.escape_text(str(item)), encoding)
-                    for item in value))
+                output += b']['.join(
+                    self.escape_text(str(item)).encode(encoding)
+                    for item in value)
             else:
-                parts.append(bytes(self.escape_text(str(value)), encoding))
-            parts.append(b']')
-        return b''.join(parts)
+                output += self.escape_text(str(value)).encode(encoding)
+            output += b']'
+        result = bytes(output)
+        self.__dict__['_cached_bytes'] = result
+        return result
 
     def __repr__(self):
         content = ', '.join(f'{name}={value!r}' for name, value in self.items())
         return f'{self.__class__.__name__}({content})'
 
     def deepcopy(self):
+        # Values are only strings (immutable) or lists of strings, so a
+        # list-copy per value is all `copy.deepcopy` would do anyway,
+        # without the generic dispatch & memoization machinery:
         copy = self.__class__()
-        dict.update(copy, deepcopy(dict(self.items())))
+        dict.update(copy, {
+            name: value[:] if type(value) is list else value
+            for (name, value) in self.items()})
         return copy
 
     chars_to_escape = ['\\', ']']
     """List of characters that need to be backslash-escaped."""
 
-    chars_to_escape_pattern = None
-    """Regexp pattern for isolating characters for backslash escaping.
-    Initialized when `Node.escape_text` is first executed."""
-
-    def compile_chars_to_escape_pattern(self):
-        return re.compile(
-            '(' + '|'.join(re.escape(char) for char in self.chars_to_escape)
-            + ')')
+    chars_to_escape_pattern = re.compile(
+        '([' + re.escape(''.join(chars_to_escape)) + '])')
+    """Pattern matching any character that needs backslash escaping.
+    Compiled once, at class-definition time."""
 
     def escape_text(self, text):
         """Add backslash-escapes to property value characters that need them."""
-        if self.chars_to_escape_pattern is None:
-            object.__setattr__(
-                self, 'chars_to_escape_pattern',
-                self.compile_chars_to_escape_pattern())
-        return ''.join(
-            # escapable characters are at all odd indexes:
-            ('\\' if index % 2 else '') + part
-            for (index, part) in enumerate(
-                self.chars_to_escape_pattern.split(text)))
+        # Most values (coordinates, numbers, dates) need no escaping; two
+        # substring scans are cheaper than any substitution machinery:
+        if '\\' not in text and ']' not in text:
+            return text
+        return self.chars_to_escape_pattern.sub(r'\\\1', text)
 
     def set_encoding(self, encoding):
         object.__setattr__(self, 'encoding', encoding)
@@ -607,44 +772,76 @@ class Node(dict):
         Return True iff `self` and `other` are equivalent: both the same type
         of node (setup or move), same player & coordinates if a move, etc.
         """
-        my_type = self.node_type()
-        other_type = other.node_type()
-        if my_type is None or other_type is None:
-            return True
-        if my_type != other_type:
-            return False
-        if my_type == 'move':
-            # Check that the same player played, and the coordinates match:
-            self_props = set(self.keys())
-            self_player = self_props & self.move_required_properties
-            if (num_players := len(self_player)) != 1:
-                raise PropertyError(
-                    f'Expected 1 player move in `self` node, {num_players} '
-                    f'found.')
-            other_props = set(other.keys())
-            other_player = other_props & self.move_required_properties
-            if (num_players := len(other_player)) != 1:
-                raise PropertyError(
-                    f'Expected 1 player move in `other` node, {num_players} '
-                    f'found.')
-            if self_player != other_player:
-                return False
-            player = self_player.pop()
-            if self[player] != other[player]:
-                # different coordinates
-                return False
-        return True
+        my_signature = self.merge_signature()
+        other_signature = other.merge_signature()
+        return (my_signature is None or other_signature is None
+                or my_signature == other_signature)
+
+    def merge_signature(self):
+        """
+        Return a hashable signature for pairing equivalent nodes during a
+        merge: the node type, plus player & coordinates for move nodes.
+        `None` (typeless nodes, e.g. empty-comment-only) acts as a
+        wildcard, equivalent to any node (see `equivalent`). Nodes that
+        cannot be classified get a unique signature that matches nothing
+        (except a wildcard), never an exception.
+
+        The result is cached on the instance (as for `node_type`): merges
+        re-derive signatures for the same head nodes at every recursion
+        level, once for branch pairing & again for node comparison.
+        """
+        try:
+            return self.__dict__['_cached_merge_signature']
+        except KeyError:
+            pass
+        try:
+            node_type = self.node_type()
+        except PropertyError:
+            # A node the type system can't classify (e.g. a non-empty
+            # comment-only node, which merge output itself produces) must
+            # not abort the merge: give it a unique signature that pairs
+            # with nothing, so it is kept as its own variation.
+            node_type = signature = object()
+        if node_type != 'move':
+            signature = node_type
+        else:
+            # `move_required_properties` is tiny (B & W), so direct
+            # membership tests beat building & intersecting key sets:
+            players = [
+                pid for pid in self.move_required_properties if pid in self]
+            if len(players) == 1:
+                signature = ('move', players[0], self[players[0]])
+            else:
+                # zero or several players in one move node: likewise
+                # unmatchable, rather than an error:
+                signature = object()
+        self.__dict__['_cached_merge_signature'] = signature
+        return signature
 
     def node_type(self):
+        """
+        Return this node's type ('root', 'setup', 'move', or `None`).
+
+        The result is cached on the instance; the cache is invalidated
+        whenever a property is added or removed.
+        """
+        try:
+            return self.__dict__['_cached_node_type']
+        except KeyError:
+            pass
         props = set(self.keys())
         if not props or 'C' in props and not self.C:
-            return None
-        for (node_type, node_type_properties) in self.node_types.items():
-            if props & node_type_properties:
-                return node_type
+            result = None
         else:
-            raise PropertyError(
-                f'Unknown node type for node with properties {props}')
+            for (node_type, node_type_properties) in self.node_types.items():
+                if props & node_type_properties:
+                    result = node_type
+                    break
+            else:
+                raise PropertyError(
+                    f'Unknown node type for node with properties {props}')
+        self.__dict__['_cached_node_type'] = result
+        return result
 
     def merge(self, other, comment=None, comments_everywhere=True,
               ignore_property_values=None):
@@ -662,11 +859,14 @@ class Node(dict):
             comment = f'{comment}\n'
         if ignore_property_values is None:
             ignore_property_values = dict()
+        # Hoist the class-attribute lookups out of the property loop:
+        scalar_properties = self.scalar_properties
+        default_ignore_values = self.ignore_property_values
         for (property_id, other_value) in other.items():
             ignore_values = (
-                self.ignore_property_values.get(property_id, set())
+                default_ignore_values.get(property_id, set())
                 | ignore_property_values.get(property_id, set()))
-            if (  property_id in self.scalar_properties
+            if (  property_id in scalar_properties
                   and ((any in ignore_values)
                        or (other_value in ignore_values))):
                 continue
@@ -687,7 +887,7 @@ class Node(dict):
                     else:
                         self['C'] = f'{other_value.strip()}'
             elif property_id in self:
-                if property_id in self.scalar_properties:
+                if property_id in scalar_properties:
                     if other_value != self[property_id]:
                         self.merge_differing_scalar_property_values(
                             property_id, other_value, ignore_values)
@@ -697,8 +897,10 @@ class Node(dict):
                     other_values = set(other_value)
                     if extras := (other_values - self_values):
                         self[property_id].extend(extras)
+                        # in-place list mutation bypasses __setitem__:
+                        self.__dict__.pop('_cached_bytes', None)
             else:
-                if property_id in self.scalar_properties:
+                if property_id in scalar_properties:
                     self[property_id] = other_value
                 else:
                     self[property_id] = other_value[:]
@@ -831,49 +1033,52 @@ Maybe use an option:
     property_names = {value: key for (key, value) in property_ids.items()}
     """Mapping of property name to SGF property ID."""
 
-    list_properties = {
+    property_id_bytes = {key: key.encode(NAME_ENCODING) for key in property_ids}
+    """Mapping of SGF property ID to its pre-encoded `bytes` form."""
+
+    list_properties = frozenset({
         'AB', 'AE', 'AR', 'AW', 'CR', 'DD', 'LB', 'LN', 'MA', 'SL', 'SQ',
-        'TB', 'TR', 'TW', 'VW',}
+        'TB', 'TR', 'TW', 'VW',})
     """IDs of properties with multiple values, stored in lists. Other
     properties are scalars (single values; see `Node.scalar_properties`)."""
 
-    scalar_properties = {
+    scalar_properties = frozenset({
         'AN', 'AP', 'AS', 'B', 'BL', 'BM', 'BR', 'BT', 'C', 'CA', 'CP', 'DM',
         'DO', 'DT', 'EV', 'FF', 'FG', 'GB', 'GC', 'GM', 'GN', 'GW', 'HA',
         'HO', 'IP', 'IT', 'IY', 'KM', 'KO', 'MN', 'N', 'OB', 'ON', 'OT', 'OW',
         'PB', 'PC', 'PL', 'PM', 'PW', 'RE', 'RO', 'RU', 'SE', 'SO', 'ST',
-        'SU', 'SZ', 'TE', 'TM', 'UC', 'US', 'V', 'W', 'WL', 'WR', 'WT',}
+        'SU', 'SZ', 'TE', 'TM', 'UC', 'US', 'V', 'W', 'WL', 'WR', 'WT',})
     """IDs of properties with single values. Other properties have multiple
     values (see `Node.list_properties`)."""
 
-    text_properties = {
+    text_properties = frozenset({
         'AN', 'AP', 'AS', 'BR', 'BT', 'C', 'CA', 'CP', 'DT', 'EV', 'FG', 'GC',
         'GN', 'IP', 'IY', 'LB', 'N', 'ON', 'OT', 'PB', 'PC', 'PW', 'RE', 'RO',
-        'RU', 'SO', 'SU', 'US', 'WR', 'WT',}
+        'RU', 'SO', 'SU', 'US', 'WR', 'WT',})
     """IDs of properties with values of type text & simpletext, encoded per
     the CA/charset property. Other properties are ASCII-encoded."""
 
-    real_properties = {'KM', 'BL', 'TM', 'V', 'WL',}
+    real_properties = frozenset({'KM', 'BL', 'TM', 'V', 'WL',})
     """IDs of properties with real-number values."""
 
-    root_only_properties = {
+    root_only_properties = frozenset({
         'AP', 'CA', 'FF', 'GM', 'ST', 'SZ', 'AN', 'BR', 'BT', 'CP', 'DT',
         'EV', 'GN', 'GC', 'ON', 'OT', 'PB', 'PW', 'PC', 'RE', 'RO', 'RU',
-        'SO', 'TM', 'US', 'WR', 'WT',}
+        'SO', 'TM', 'US', 'WR', 'WT',})
     """IDs of properties that only appear in the root node (which is also a
     setup node)."""
 
-    setup_properties = {'AB', 'AW', 'AE', 'PL',}
+    setup_properties = frozenset({'AB', 'AW', 'AE', 'PL',})
     """IDs of properties that appear in setup nodes (incl. the root node)."""
 
     root_properties = root_only_properties | setup_properties
     """IDs of properties that appear in root nodes."""
 
-    move_properties = {
-        'B', 'W', 'KO', 'MN', 'BM', 'DO', 'IT', 'TE', 'BL', 'OB', 'OW', 'WL',}
+    move_properties = frozenset({
+        'B', 'W', 'KO', 'MN', 'BM', 'DO', 'IT', 'TE', 'BL', 'OB', 'OW', 'WL',})
     """IDs of properties that appear in move nodes."""
 
-    move_required_properties = {'B', 'W',}
+    move_required_properties = frozenset({'B', 'W',})
     """IDs of properties that must appear in move nodes."""
 
     ignore_property_values = {
@@ -1021,7 +1226,8 @@ Maybe use an option:
 #         if self.index + 1 < len(self.gametree):
 #             self.children = [self.gametree[self.index+1]]
 #         else:
-#             self.children = map(lambda list: list[0], self.gametree.branches)
+#             self.children = list(
+#                 map(operator.itemgetter(0), self.gametree.branches))
 
 #     def _set_flags(self):
 #         """Set up the flags `self.at_end` and `self.at_start`."""
@@ -1031,6 +1237,25 @@ Maybe use an option:
 #         self.at_start = not self.stack and (self.index == 0)
 
 
+class parser_patterns:
+    """Regular expression text matching patterns, compiled once at module
+    load. Also available as `Parser.patterns`."""
+    whitespace      = re.compile(rb'\s*')
+    game_tree_start = re.compile(rb'\(')
+    game_tree_end   = re.compile(rb'\)')
+    # The unified tokenizer: leading whitespace plus one group per token
+    # type, so dispatch can test the integer `match.lastindex` (1=";",
+    # 2="(", 3=")", 4=property ID) instead of comparing bytes, and each
+    # token costs a single C-level match call:
+    token           = re.compile(
+        rb'\s*(?:(;)|(\()|(\))|([A-Za-z]+(?=\s*\[)))')
+    property_start  = re.compile(rb'\[')
+    # escaped line break (CR, LF, CR/LF, LF/CR; removed), other escaped
+    # character (kept), or the closing "]":
+    property_body   = re.compile(
+        rb'\\(?:\r\n?|\n\r?)|\\(.)|(\])', re.DOTALL)
+
+
 class Parser:
 
     """
@@ -1041,16 +1266,18 @@ class Parser:
 
     encoding = 'latin-1'
 
-    class patterns:
-        """Regular expression text matching patterns."""
-        game_tree_start = re.compile(rb'\s*\(')
-        game_tree_end   = re.compile(rb'\s*\)')
-        game_tree_next  = re.compile(rb'\s*(;|\(|\))')
-        node_contents   = re.compile(rb'\s*([A-Za-z]+(?=\s*\[))')
-        property_start  = re.compile(rb'\s*\[')
-        property_end    = re.compile(rb'\]')
-        escape          = re.compile(rb'\\')
-        line_break      = re.compile(rb'\r\n?|\n\r?')    # CR, LF, CR/LF, LF/CR
+    patterns = parser_patterns
+    """Matching-patterns namespace (module-level `parser_patterns`), kept as
+    a class attribute for subclasses that override individual patterns."""
+
+    interned_property_ids = {
+        name.encode(NAME_ENCODING): sys.intern(name)
+        for name in Node.property_ids}
+    """Mapping of encoded property IDs to interned strings. Interning lets
+    all parsed nodes share one canonical key object per property ID, saving
+    memory & making dict lookups pointer comparisons. The `Node.*_properties`
+    frozensets hold these same interned objects (source-literal strings), so
+    their membership tests hit the identity shortcut too."""
 
     # character translation tables
     # for control characters (except LF \012 & CR \015): convert to spaces
@@ -1064,7 +1291,14 @@ class Parser:
 
     def __init__(self, data):
         self.data = data
-        """The complete SGF data instance (`bytes`)."""
+        """The complete SGF data instance: `bytes`, or any bytes-like
+        buffer with `find` (e.g. `mmap.mmap`). Scanning advances
+        `self.index` over this buffer in place; no intermediate slices are
+        made except to extract property values."""
+
+        self.dataview = memoryview(data)
+        """Zero-copy view of `self.data`, for slicing out value fragments
+        without allocating intermediate bytes objects."""
 
         self.datalen = len(data)
         """Length of `self.data`."""
@@ -1072,18 +1306,43 @@ class Parser:
         self.index = 0
         """Current parsing position in `self.data`."""
 
+        self.duplicate_properties = 0
+        """Count of duplicate property IDs encountered (& appended)."""
+
     def parse(self):
         """
         Parse the SGF data stored in `self.data`, and return a `Collection`.
         """
         collection = Collection()
+        collection.extend(self.iter_games())
+        self.warn_duplicate_properties()
+        return collection
+
+    def warn_duplicate_properties(self):
+        """
+        Issue one warning covering all duplicate property IDs counted so
+        far, & reset the count. Any entry point that drives parsing
+        (`parse()`, `Summary.summarize()`) must call this; per-duplicate
+        warnings are deferred because `warnings.warn` walks the stack on
+        every call.
+        """
+        if self.duplicate_properties:
+            warnings.warn(
+                f'{self.duplicate_properties} duplicate property ID(s) '
+                f'encountered in nodes while parsing. '
+                f'New values were appended to existing values.')
+            self.duplicate_properties = 0
+
+    def iter_games(self):
+        """
+        Lazily parse `self.data`, yielding one `GameTree` per game.
+        """
         while self.index < self.datalen:
             game = self.parse_one_game()
             if game:
-                collection.append(game)
+                yield game
             else:
                 break
-        return collection
 
     def parse_one_game(self):
         """
@@ -1091,6 +1350,8 @@ class Parser:
         game, or `None` if the end of `self.data` has been reached.
         """
         if self.index < self.datalen:
+            self.index = self.patterns.whitespace.match(
+                self.data, self.index).end()
             match = self.patterns.game_tree_start.match(self.data, self.index)
             if match:
                 self.index = match.end()
@@ -1106,22 +1367,34 @@ class Parser:
         Raise `TreeParseError` if a problem is encountered.
         """
         g = GameTree()
-        while self.index < self.datalen:
-            match = self.patterns.game_tree_next.match(self.data, self.index)
+        # Hoist the pattern-method & buffer lookups out of the scan loop;
+        # this method is called once per "(" and loops once per token:
+        data = self.data
+        datalen = self.datalen
+        match_token = self.patterns.token.match
+        while self.index < datalen:
+            match = match_token(data, self.index)
             if match:
-                self.index = match.end()
-                if match.group(1) == b';':
-                    # found start of node
+                token = match.lastindex
+                if token == 1:
+                    # found start of node ";"
+                    self.index = match.end()
                     if g.branches:
                         raise TreeParseError(
                             "A node was encountered after a branch.")
                     g.append(self.parse_node())
-                elif match.group(1) == b'(':
-                    # found start of branch
+                elif token == 2:
+                    # found start of branch "("
+                    self.index = match.end()
                     g.branches = self.parse_branches()
-                else:
+                elif token == 3:
                     # found end of GameTree ")"
+                    self.index = match.end()
                     return g
+                else:
+                    # found a property ID outside of any node
+                    raise TreeParseError(
+                        'A property was encountered outside of a node.')
             else:
                 raise TreeParseError('Past end of SGF.')
         g.encoding = self.encoding
@@ -1138,16 +1411,23 @@ class Parser:
         before the end of the enclosing `GameTree`.
         """
         v = []
-        while self.index < self.datalen:
+        data = self.data
+        datalen = self.datalen
+        match_ws = self.patterns.whitespace.match
+        match_end = self.patterns.game_tree_end.match
+        match_start = self.patterns.game_tree_start.match
+        while self.index < datalen:
+            self.index = match_ws(data, self.index).end()
             # check for ")" at end of GameTree, but don't consume it
-            match = self.patterns.game_tree_end.match(self.data, self.index)
+            match = match_end(data, self.index)
             if match:
                 return v
             g = self.parse_game_tree()
             if g:
                 v.append(g)
             # check for next branch, and consume "("
-            match = self.patterns.game_tree_start.match(self.data, self.index)
+            self.index = match_ws(data, self.index).end()
+            match = match_start(data, self.index)
             if match:
                 self.index = match.end()
         raise EndOfDataParseError
@@ -1172,20 +1452,39 @@ class Parser:
         start of a branch, or the end of the enclosing game tree).
         """
         node = Node()
-        while self.index < self.datalen:
-            match = self.patterns.node_contents.match(self.data, self.index)
-            if not match:
-                # reached end of Node
+        data = self.data
+        datalen = self.datalen
+        match_token = self.patterns.token.match
+        # hoist the class-attribute lookups out of the property loop:
+        text_properties = Node.text_properties
+        list_properties = Node.list_properties
+        # cache the text encoding locally; only a CA property changes it:
+        text_encoding = self.encoding
+        while self.index < datalen:
+            match = match_token(data, self.index)
+            if not match or match.lastindex != 4:
+                # reached end of Node; leave the next token (";", "(", or
+                # ")") unconsumed, for the enclosing parse_game_tree:
                 return node
-            property_id = match.group(1).decode(NAME_ENCODING)
+            property_id = self.interned_property_ids.get(match.group(4))
+            if property_id is None:
+                # unknown property ID; decode & intern it on the fly:
+                property_id = sys.intern(
+                    match.group(4).decode(NAME_ENCODING))
             self.index = match.end()
             pvlist = self.parse_property_value()
             if not pvlist:
                 raise NodePropertyParseError
-            encoding = (self.encoding if property_id in node.text_properties
+            encoding = (text_encoding if property_id in text_properties
                         else NAME_ENCODING)
-            pvlist = [item.decode(encoding) for item in pvlist]
-            if property_id in node.list_properties:
+            if len(pvlist) == 1:
+                pvlist = [pvlist[0].decode(encoding)]
+            else:
+                # one decode call for the whole list, instead of one per
+                # value; \x01 cannot occur in values (control characters
+                # have been converted to spaces):
+                pvlist = b'\x01'.join(pvlist).decode(encoding).split('\x01')
+            if property_id in list_properties:
                 value = pvlist
             elif len(pvlist) == 1:
                 value = pvlist[0]
@@ -1194,11 +1493,10 @@ class Parser:
                     f'Expected a scalar value, got a list: {property_id}'
                     f'[{"][".join(pvlist)}]')
             if property_id in node:
-                warnings.warn(
-                    f'Duplicate property ID "{property_id}" in node '
-                    f'(existing value: "{node[property_id]}"; '
-                    f'new value: "{value}"). Appending new value.')
-                if property_id in node.list_properties:
+                # Count now, warn once at the end of the parse;
+                # `warnings.warn` walks the stack on every call:
+                self.duplicate_properties += 1
+                if property_id in list_properties:
                     node[property_id].extend(value)
                 else:
                     node[property_id] = f'{node[property_id]}\n\n{value}'
@@ -1206,7 +1504,7 @@ class Parser:
                 node[property_id] = value
             # CA == charset
             if property_id == 'CA':
-                self.encoding = pvlist[0]
+                self.encoding = text_encoding = pvlist[0]
                 # detect encoding on input, force UTF-8 on output:
                 node['CA'] = TEXT_ENCODING
         raise EndOfDataParseError
@@ -1221,39 +1519,51 @@ class Parser:
         Raise `PropertyValueParseError` if there is a problem.
         """
         pvlist = []
-        while self.index < self.datalen:
-            match = self.patterns.property_start.match(self.data, self.index)
+        data = self.data
+        dataview = self.dataview
+        datalen = self.datalen
+        match_ws = self.patterns.whitespace.match
+        match_start = self.patterns.property_start.match
+        finditer_body = self.patterns.property_body.finditer
+        convert_control_chars = self._convert_control_chars
+        while self.index < datalen:
+            self.index = match_ws(data, self.index).end()
+            match = match_start(data, self.index)
             if match:
-                self.index = match.end()
-                value_parts = []
+                start = match.end()
+                # Fast path: no escapes before the closing "]" (the common
+                # case — coordinates, numbers, most text). Two memchr-backed
+                # find() calls, no regex machinery:
+                end = data.find(b']', start)
+                if end < 0:
+                    raise PropertyValueParseError
+                if data.find(b'\\', start, end) < 0:
+                    self.index = end + 1
+                    pvlist.append(convert_control_chars(data[start:end]))
+                    continue
                 # scan for escaped characters (using '\'), unescape them
-                # (remove linebreaks)
-                mend = self.patterns.property_end.search(self.data, self.index)
-                mesc = self.patterns.escape.search(self.data, self.index)
-                while mesc and mend and (mesc.end() < mend.end()):
-                    # copy up to '\' escape, but remove '\'
-                    value_parts.append(self.data[self.index:mesc.start()])
-                    mbreak = self.patterns.line_break.match(
-                        self.data, mesc.end())
-                    if mbreak:
-                        # remove linebreak:
-                        self.index = mbreak.end()
-                    else:
-                        # copy escaped character (slice to prevent
-                        # int-conversion):
-                        value_parts.append(self.data[mesc.end():mesc.end()+1])
-                        # move to point after escaped char:
-                        self.index = mesc.end() + 1
-                    mend = self.patterns.property_end.search(
-                        self.data, self.index)
-                    mesc = self.patterns.escape.search(self.data, self.index)
-                if mend:
-                    value_parts.append(self.data[self.index:mend.start()])
-                    self.index = mend.end()
-                    pvlist.append(
-                        self._convert_control_chars(b''.join(value_parts)))
-                else:
+                # (remove linebreaks), in a single pass over the value.
+                # Unescaped runs are collected as zero-copy memoryview
+                # slices; b''.join accepts them directly:
+                value_parts = []
+                prev = start
+                end = -1
+                for m in finditer_body(data, prev):
+                    value_parts.append(dataview[prev:m.start()])
+                    if m.group(2):
+                        # unescaped "]": end of the value
+                        end = m.end()
+                        break
+                    escaped = m.group(1)
+                    if escaped is not None:
+                        # keep the escaped character, drop the '\';
+                        # escaped linebreaks are dropped entirely:
+                        value_parts.append(escaped)
+                    prev = m.end()
+                if end < 0:
                     raise PropertyValueParseError
+                self.index = end
+                pvlist.append(convert_control_chars(b''.join(value_parts)))
             else:
                 # reached end of Property
                 break
@@ -1267,8 +1577,7 @@ class Parser:
         Convert control characters in `text` to spaces, using the
         `self.ctrltrans` translation table. Override for variant behaviour.
         """
-        #???return string.translate(text, self.ctrltrans)
-        return text
+        return text.translate(self.ctrltrans)
 
 
 class RootNodeParser(Parser):
@@ -1315,16 +1624,22 @@ class Summary:
         'filename' : 'Filename',
         }
 
-    summary_table_format = '\t'.join(f"{{{ID}}}" for ID in summary_fields)
+    # Positional templates, filled via `summary_field_getter` below; named
+    # placeholders would re-build a kwargs dict per game:
 
-    summary_header = summary_table_format.format(**summary_fields)
+    summary_table_format = '\t'.join(['{}'] * len(summary_fields))
+
+    summary_header = summary_table_format.format(*summary_fields.values())
 
     summary_list_format = (
         '* '
-        + '\n  '.join(f"{':'+fullname+':':12} {{{ID}}}"
-                      for ID, fullname in summary_fields.items())
+        + '\n  '.join(f"{':'+fullname+':':12} {{}}"
+                      for fullname in summary_fields.values())
         + '\n')
 
+    summary_field_getter = operator.itemgetter(*summary_fields)
+    """Extracts the summary field values, in order, from `self.properties`."""
+
     #ctrltrans = string.maketrans(
     #    ("\000\001\002\003\004\005\006\007\010\011\012\013"
     #     "\014\015\016\017\020\021\022\023\024\025\026\027"
@@ -1353,10 +1668,17 @@ class Summary:
         """File validity flag."""
 
         with open(path, 'rb') as src:
-            data = src.read()
+            try:
+                # Zero-copy I/O: the OS pages the file in lazily as the
+                # parser advances. The mapping outlives the file object &
+                # is released when the last reference to it is dropped.
+                data = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # an empty file cannot be mapped:
+                data = src.read()
 
         self.data = data
-        """Raw SGF file contents."""
+        """Raw SGF file contents (memory-mapped, where possible)."""
 
         parser_class = Parser if game_collections else RootNodeParser
 
@@ -1377,10 +1699,11 @@ class Summary:
         SGF.
         """
         if self.is_sgf:
+            values = self.summary_field_getter(self.properties)
             if self.format == 'list':
-                return self.summary_list_format.format(**self.properties)
+                return self.summary_list_format.format(*values)
             else:
-                return self.summary_table_format.format(**self.properties)
+                return self.summary_table_format.format(*values)
         else:
             return ''
 
@@ -1390,6 +1713,7 @@ class Summary:
         ``False`` for failure (no more games, or not an SGF file).
         """
         game = self.parser.parse_one_game()
+        self.parser.warn_duplicate_properties()
         if not game:
             # no more games:
             return False
@@ -1415,11 +1739,40 @@ class Summary:
     #                                timeMatch.group(1) + ":" + timeMatch.group(2))
 
     def reset_properties(self):
-        for key in self.summary_fields:
-            self.properties[key] = ''
+        self.properties = dict.fromkeys(self.summary_fields, '')
         self.properties['filename'] = self.filename
 
 
+def summarize_file(file_path, game_collections=True, format='table'):
+    """
+    Summarize all games in one SGF file; return a list of output lines.
+
+    Defined at module level so `SummaryCLI` can fan it out over a process
+    pool (bound methods don't pickle).
+    """
+    lines = []
+    sgfsum = Summary(file_path, game_collections, format)
+    while sgfsum.summarize():
+        summary = str(sgfsum)
+        if summary:
+            lines.append(summary)
+        else:
+            lines.append(f'Not a valid SGF file: "{file_path}"')
+    return lines
+
+
+def load_normalized(game_path):
+    """
+    Load & normalize one SGF game file; return the `Collection`.
+
+    Defined at module level so `MergerCLI` can fan it out over a process
+    pool (bound methods don't pickle).
+    """
+    game = Collection.load(game_path)
+    game.normalize()
+    return game
+
+
 class CLI:
 
     """
@@ -1484,6 +1837,30 @@ class CLI:
         The subclass must declare `argument_specs`, the CLI arguments &
         options specifications. See the class docstring.
         """
+        parser = cls.get_parser()
+        if argv is None:
+            argv = sys.argv[1:]
+        settings = parser.parse_args(argv)
+        return settings
+
+    @classmethod
+    def get_parser(cls):
+        """
+        Return the class's argument parser, building it on first use.
+
+        `argument_specs` is immutable class-level data, so the parser is
+        built once per subclass & shared by all instantiations (each
+        `parse_args` call returns a fresh namespace).
+        """
+        if '_parser' not in cls.__dict__:
+            cls._parser = cls.build_parser()
+        return cls._parser
+
+    @classmethod
+    def build_parser(cls):
+        """
+        Return a new `argparse.ArgumentParser` built from `cls.argument_specs`.
+        """
         parser = argparse.ArgumentParser(
             description=textwrap.dedent(cls.__doc__),
             formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1501,10 +1878,7 @@ class CLI:
                 parser.add_argument(*names, **params)
         names, params = cls.help_option_spec
         parser.add_argument(*names, **params)
-        if argv is None:
-            argv = sys.argv[1:]
-        settings = parser.parse_args(argv)
-        return settings
+        return parser
 
 
 class SummaryCLI(CLI):
@@ -1529,32 +1903,38 @@ class SummaryCLI(CLI):
 
     def execute(self):
         """
-        Iterate through SGF files, outputting summaries.
+        Iterate through SGF files (in parallel, across processor cores),
+        outputting summaries.
         """
         format = 'list' if self.settings.list_format else 'table'
         if format == 'table':
             print(Summary.summary_header)
+        file_paths = []
         for path in self.settings.source_file_or_dir_paths:
             if os.path.isdir(path):
-                srcpath = path
-                srcfiles = os.listdir(path)
+                # scandir caches the file type from the directory read, so
+                # subdirectories are skipped without a stat() per entry:
+                with os.scandir(path) as entries:
+                    file_paths.extend(
+                        entry.path for entry in entries
+                        if not entry.is_dir())
             else:
-                srcpath, srcfile = os.path.split(path)
-                srcfiles = [srcfile]
-            for filename in srcfiles:
-                file_path = os.path.join(srcpath, filename)
-                if os.path.isdir(file_path):
-                    # ignore subdirectories
-                    continue
-                sgfsum = Summary(file_path, self.settings.collections, format)
-                # Summarize one game at a time from SGF file:
-                while sgfsum.summarize():
-                    summary = str(sgfsum)
-                    if summary:
-                        # print summary for valid files
-                        print(summary)
-                    else:
-                        print(f'Not a valid SGF file: "{file_path}"')
+                file_paths.append(path)
+        summarize = functools.partial(
+            summarize_file,
+            game_collections=self.settings.collections, format=format)
+        if len(file_paths) > 1:
+            # Each file is independent & the parser is CPU-bound, so fan
+            # the work out over processes. `map` preserves input order:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                for lines in executor.map(
+                        summarize, file_paths, chunksize=16):
+                    for line in lines:
+                        print(line)
+        else:
+            for file_path in file_paths:
+                for line in summarize(file_path):
+                    print(line)
 
     argument_specs = (
         (('source_file_or_dir_paths',),
@@ -1663,19 +2043,30 @@ class MergerCLI(CLI):
                 else:
                     value = any
                 ignore_property_values[property_id].add(value)
-        for game_path in [
-                self.settings.primary_game, *self.settings.secondary_games]:
-            game = Collection.load(game_path)
-            game.normalize()
-            comment = self.settings.comments.get(game_path)
-            if comment is None and self.settings.filename_comments:
+        game_paths = [
+            self.settings.primary_game, *self.settings.secondary_games]
+        if len(self.settings.secondary_games) > 2 and '-' not in game_paths:
+            # Loading & normalizing each input is independent work; only
+            # the merges below must run in order. <stdin> ("-") cannot be
+            # read from a worker process, so such runs stay serial.
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                games = list(executor.map(load_normalized, game_paths))
+        else:
+            games = map(load_normalized, game_paths)
+        start, end = self.settings.comment_delimiters
+        # hoist per-run settings out of the per-game loop:
+        comments = self.settings.comments
+        filename_comments = self.settings.filename_comments
+        comments_everywhere = self.settings.comments_everywhere
+        for (game_path, game) in zip(game_paths, games):
+            comment = comments.get(game_path)
+            if comment is None and filename_comments:
                 if game_path == '-':
                     comment = ''
                 else:
-                    start, end = self.settings.comment_delimiters
                     comment = f'{start}{game_path}{end}'
             try:
-                result.merge(game, comment, self.settings.comments_everywhere,
+                result.merge(game, comment, comments_everywhere,
                              ignore_property_values=ignore_property_values)
             except MergeError as error:
                 print(
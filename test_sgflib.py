@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import functools
 import sys
 import io
 
@@ -9,6 +10,25 @@ import pytest
 import sgflib
 
 
+@functools.cache
+def expected_output(expected_path, load_expected_as_game):
+    """
+    Read one expected-output fixture (normalized via a Collection round-trip
+    if `load_expected_as_game`), cached so repeated parameter cases reading
+    the same fixture parse it only once.
+
+    Fixtures are read & compared as bytes throughout; never decode them to
+    str just to compare.
+    """
+    with open(expected_path, 'rb') as expected_file:
+        expected = expected_file.read()
+    if load_expected_as_game:
+        game = sgflib.Collection.load(data=expected)
+        game.normalize()
+        expected = bytes(game)
+    return expected
+
+
 class TestNode:
 
     @staticmethod
@@ -66,6 +86,20 @@ class TestGameTree:
         g = sgflib.GameTree(n)
         assert str(g) == '(\n{}\n)'.format(TestNode.node1_str)
 
+    def test_property_search(self):
+        collection = sgflib.Collection.load(
+            data=b'(;GM[1]FF[4];B[aa]C[first](;W[bb];B[cc])(;W[dd]C[last]))')
+        g = collection[0]
+        # first match only, by short ID & by long property name:
+        assert [n['B'] for n in g.property_search('B')] == ['aa']
+        assert [n['C'] for n in g.property_search('comment')] == ['first']
+        # all matches, depth-first (trunk, then each branch in order):
+        assert [n['W'] for n in g.property_search('W', 1)] == ['bb', 'dd']
+        assert [n['C'] for n in g.property_search('comment', 1)] == [
+            'first', 'last']
+        # no matches:
+        assert g.property_search('AB', 1) == sgflib.GameTree()
+
 
 class TestParser:
 
@@ -266,6 +300,19 @@ class TestMerge:
             assert result.pretty() == game.pretty()
             assert result == game
 
+    def test_merge_comment_headed_variation(self):
+        """Merge a game whose extra variation starts with a comment-only
+        node, as merge output itself produces."""
+        primary = sgflib.Collection.load(
+            data=b'(;GM[1]FF[4];B[aa](;W[bb];B[cc])(;W[dd]))')
+        secondary = sgflib.Collection.load(
+            data=b'(;GM[1]FF[4];B[aa](;W[bb];B[cc])(;W[dd])'
+                 b'(;C[consider the other side];W[ee]))')
+        primary.normalize()
+        secondary.normalize()
+        primary.merge(secondary)
+        assert primary == secondary
+
     def test_merge_with_one_comment(self):
         """Merge single game twice, with a comment on the second merge."""
         for (i, sgfdata) in enumerate(self.sgfdata_singles):
@@ -350,32 +397,9 @@ class TestMerge:
         with io.BytesIO() as cli.settings.output:
             cli.run()
             merged = cli.settings.output.getvalue()
-        with open(expected_path, 'rb') as expected_file:
-            expected = expected_file.read()
-        if load_expected_as_game:
-            game = sgflib.Collection.load(data=expected)
-            game.normalize()
-            expected = bytes(game)
+        expected = expected_output(expected_path, load_expected_as_game)
         assert merged == expected
 
-    ## old version:
-    # def test_MergerCLI(self):
-    #     for (i, config) in enumerate(self.merger_CLI_configs):
-    #         argv, expected_path, normalize = config
-    #         print(i, (argv, expected_path, normalize))
-    #         cli = sgflib.MergerCLI(argv=argv)
-    #         with io.BytesIO() as cli.settings.output:
-    #             cli.run()
-    #             merged = cli.settings.output.getvalue()
-    #         if normalize:
-    #             expected = sgflib.Collection.load(expected_path)
-    #             expected.normalize()
-    #         else:
-    #             expected = open(expected_path, encoding='utf-8').read()
-    #         assert merged.decode('utf-8') == str(expected)
-    #         print(i, 'OK')
-            
-
 def self_test_1(onConsole=0):
     """Canned data test case"""
     sgfdata = r"""       (;GM [1]US[someone]CP[\